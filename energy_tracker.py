@@ -1,19 +1,11 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 from datetime import datetime, date
-import plotly.express as px
-import plotly.graph_objects as go
 
-# Page config
-st.set_page_config(
-    page_title="Energy Consumption Tracker",
-    page_icon="⚡",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# pandas and plotly are imported where they are first needed: they are only
+# used once a profile is saved, and importing them up front slows cold start
 
-# Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -45,42 +37,149 @@ st.markdown("""
         font-weight: bold;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page config
+st.set_page_config(
+    page_title="Energy Consumption Tracker",
+    page_icon="⚡",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS for better styling
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state for tracking
-if 'daily_consumption' not in st.session_state:
-    st.session_state.daily_consumption = []
+# History is stored column-wise in preallocated numpy buffers (day ordinals as
+# int32, readings as float64); only the first history_len rows are filled
+if 'consumption_cols' not in st.session_state:
+    st.session_state.consumption_cols = {
+        'date': np.empty(16, dtype=np.int32),
+        'estimated': np.empty(16, dtype=np.float64),
+        'actual': np.empty(16, dtype=np.float64),
+        'difference': np.empty(16, dtype=np.float64)
+    }
+
+if 'history_len' not in st.session_state:
+    st.session_state.history_len = 0
+
+# DataFrame and statistics for the history, rebuilt only when history_len
+# changes; the history is append-only, so its length is the version token
+if 'history_view' not in st.session_state:
+    st.session_state.history_view = None
+    st.session_state.history_view_len = 0
+
+# Trend chart is kept across reruns and extended in place on each new entry
+if 'fig' not in st.session_state:
+    st.session_state.fig = None
 
 if 'user_profile' not in st.session_state:
     st.session_state.user_profile = {}
 
+# Energy lookup tables (allocated once at import, not per rerun)
+ENERGY_MAP = {
+    "1bhk": 2.4,  # 2 * 0.4 + 2 * 0.8 kWh
+    "2bhk": 3.6,  # 3 * 0.4 + 3 * 0.8 kWh
+    "3bhk": 4.8,  # 4 * 0.4 + 4 * 0.8 kWh
+    "4bhk": 6.0   # 5 * 0.4 + 5 * 0.8 kWh
+}
+
+APPLIANCE_CONSUMPTION = {
+    "AC": 3.0,
+    "Refrigerator": 1.5,
+    "Washing Machine": 2.0,
+    "Dishwasher": 1.8,
+    "Water Heater": 2.5,
+    "Microwave": 1.2,
+    "TV": 0.5,
+    "Laptop": 0.3
+}
+
+APPLIANCE_LIST = tuple(APPLIANCE_CONSUMPTION)
+
+# History dates are stored as date.toordinal(); this shifts them to Unix days
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Cost vector aligned with APPLIANCE_LIST for vectorized lookups
+APPLIANCE_COST = np.array(list(APPLIANCE_CONSUMPTION.values()), dtype=np.float64)
+APPLIANCE_IDX = {name: i for i, name in enumerate(APPLIANCE_LIST)}
+
+@st.cache_data(show_spinner=False)
 def calculate_base_energy(facility_type):
     """Calculate base energy consumption based on facility type"""
-    energy_map = {
-        "1bhk": 2 * 0.4 + 2 * 0.8,  # 2.4 kWh
-        "2bhk": 3 * 0.4 + 3 * 0.8,  # 3.6 kWh
-        "3bhk": 4 * 0.4 + 4 * 0.8,  # 4.8 kWh
-        "4bhk": 5 * 0.4 + 5 * 0.8   # 6.0 kWh
-    }
-    return energy_map.get(facility_type, 0)
+    return ENERGY_MAP.get(facility_type, 0)
+
+@st.cache_data(show_spinner=False)
+def _calculate_appliance_energy(appliances):
+    """Cached appliance total, keyed on a sorted tuple of appliance names"""
+    return float(APPLIANCE_COST[[APPLIANCE_IDX[a] for a in appliances]].sum())
 
 def calculate_appliance_energy(appliances):
     """Calculate energy consumption for appliances"""
-    appliance_consumption = {
-        "AC": 3.0,
-        "Refrigerator": 1.5,
-        "Washing Machine": 2.0,
-        "Dishwasher": 1.8,
-        "Water Heater": 2.5,
-        "Microwave": 1.2,
-        "TV": 0.5,
-        "Laptop": 0.3
-    }
+    return _calculate_appliance_energy(tuple(sorted(appliances)))
+
+def build_view(cols, n):
+    """Build the history DataFrame and its statistics"""
+    import pandas as pd
+    
+    # Built from the filled part of each buffer; pandas copies the float
+    # columns into one block and to_datetime allocates, so this is not zero-copy
+    df = pd.DataFrame({
+        'date': pd.to_datetime(cols['date'][:n] - EPOCH_ORDINAL, unit='D'),
+        'estimated': cols['estimated'][:n],
+        'actual': cols['actual'][:n],
+        'difference': cols['difference'][:n]
+    }, copy=False)
     
-    total = 0
-    for appliance in appliances:
-        total += appliance_consumption.get(appliance, 0)
-    return total
+    # Reduce over the raw buffer, skipping pandas dispatch
+    actual_arr = cols['actual'][:n]
+    return df, float(actual_arr.mean()), float(actual_arr.max()), float(actual_arr.min())
+
+def get_history_view():
+    """Return the history view, rebuilding it only after a new entry"""
+    n = st.session_state.history_len
+    if st.session_state.history_view_len != n:
+        st.session_state.history_view = build_view(st.session_state.consumption_cols, n)
+        st.session_state.history_view_len = n
+    return st.session_state.history_view
+
+@st.cache_resource(show_spinner=False)
+def _line_layout():
+    """Shared layout for the trend chart, built once per process"""
+    import plotly.graph_objects as go
+    return go.Layout(
+        title='Daily Energy Consumption Trend',
+        xaxis_title='Date',
+        yaxis_title='Energy (kWh)',
+        height=400
+    )
+
+@st.cache_resource(show_spinner=False)
+def _pie_layout():
+    """Shared layout for the appliance breakdown chart"""
+    import plotly.graph_objects as go
+    return go.Layout(title='Energy Consumption by Appliance')
+
+def new_trend_figure():
+    """Create the empty WebGL trend chart that entries are appended to"""
+    import plotly.graph_objects as go
+    
+    return go.Figure(
+        data=[
+            go.Scattergl(x=(), y=(), mode='lines', name='estimated'),
+            go.Scattergl(x=(), y=(), mode='lines', name='actual')
+        ],
+        layout=_line_layout()
+    )
+
+def extend_trend_figure(fig, day, estimated, actual):
+    """Append a single day to the trend chart without rebuilding it"""
+    estimated_trace, actual_trace = fig.data
+    estimated_trace.x += (day,)
+    estimated_trace.y += (estimated,)
+    actual_trace.x += (day,)
+    actual_trace.y += (actual,)
 
 def get_energy_tips(total_consumption):
     """Get energy saving tips based on consumption"""
@@ -91,6 +190,50 @@ def get_energy_tips(total_consumption):
     else:
         return "🟢 Great! You're using energy efficiently. Keep up the good work!"
 
+@st.cache_data(show_spinner=False)
+def compute_summary(facility, appliances):
+    """Compute the daily totals, monthly cost and tip for a saved profile"""
+    base_energy = calculate_base_energy(facility)
+    appliance_energy = calculate_appliance_energy(appliances)
+    total_energy = base_energy + appliance_energy
+    monthly_cost = total_energy * 30 * 5  # Assuming ₹5 per kWh
+    return base_energy, appliance_energy, total_energy, monthly_cost, get_energy_tips(total_energy)
+
+def append_history(day, estimated, actual):
+    """Append one entry to the history buffers, doubling them when full"""
+    cols = st.session_state.consumption_cols
+    n = st.session_state.history_len
+    if n == len(cols['date']):
+        for key, buf in cols.items():
+            cols[key] = np.resize(buf, 2 * n)
+    
+    cols['date'][n] = day.toordinal()
+    cols['estimated'][n] = estimated
+    cols['actual'][n] = actual
+    cols['difference'][n] = actual - estimated
+    st.session_state.history_len = n + 1
+
+@st.fragment
+def log_entry_fragment(total_energy):
+    """Log today's usage; editing these inputs reruns only this fragment"""
+    st.subheader("📅 Log Today's Usage")
+    today = st.date_input("Date", value=date.today())
+    actual_consumption = st.number_input("Actual consumption (kWh)", min_value=0.0, value=total_energy, step=0.1)
+    
+    if st.button("➕ Add Entry"):
+        append_history(today, total_energy, actual_consumption)
+        
+        if st.session_state.fig is None:
+            st.session_state.fig = new_trend_figure()
+        extend_trend_figure(st.session_state.fig, today, total_energy, actual_consumption)
+        
+        # Refresh the chart and statistics outside the fragment
+        st.session_state.entry_added = True
+        st.rerun()
+    
+    if st.session_state.pop('entry_added', False):
+        st.success("✅ Entry added successfully!")
+
 # App Header
 st.markdown('<div class="main-header">⚡ Smart Energy Consumption Tracker</div>', unsafe_allow_html=True)
 
@@ -104,12 +247,12 @@ with st.sidebar.form("user_profile_form"):
     
     st.subheader("🏠 Housing Details")
     flat_type = st.selectbox("🏢 Property Type", ["Flat", "Independent House", "Tenement"])
-    facility = st.selectbox("🏠 Size", ["1bhk", "2bhk", "3bhk", "4bhk"])
+    facility = st.selectbox("🏠 Size", tuple(ENERGY_MAP))
     
     st.subheader("📱 Appliances")
     appliances = st.multiselect(
         "Select your appliances:",
-        ["AC", "Refrigerator", "Washing Machine", "Dishwasher", "Water Heater", "Microwave", "TV", "Laptop"],
+        APPLIANCE_LIST,
         default=st.session_state.user_profile.get('appliances', [])
     )
     
@@ -132,9 +275,9 @@ if st.session_state.user_profile:
     profile = st.session_state.user_profile
     
     # Calculate energy consumption
-    base_energy = calculate_base_energy(profile['facility'])
-    appliance_energy = calculate_appliance_energy(profile['appliances'])
-    total_energy = base_energy + appliance_energy
+    base_energy, appliance_energy, total_energy, monthly_cost, tip = compute_summary(
+        profile['facility'], tuple(sorted(profile['appliances']))
+    )
     
     # Display current consumption
     col1, col2, col3, col4 = st.columns(4)
@@ -149,11 +292,9 @@ if st.session_state.user_profile:
         st.metric("⚡ Total Daily", f"{total_energy:.1f} kWh")
     
     with col4:
-        monthly_cost = total_energy * 30 * 5  # Assuming ₹5 per kWh
         st.metric("💰 Monthly Cost", f"₹{monthly_cost:.0f}")
     
     # Energy saving tips
-    tip = get_energy_tips(total_energy)
     st.markdown(f'<div class="energy-tip"><strong>💡 Energy Tip:</strong> {tip}</div>', unsafe_allow_html=True)
     
     # Daily tracking section
@@ -162,42 +303,31 @@ if st.session_state.user_profile:
     col1, col2 = st.columns([2, 1])
     
     with col2:
-        st.subheader("📅 Log Today's Usage")
-        today = st.date_input("Date", value=date.today())
-        actual_consumption = st.number_input("Actual consumption (kWh)", min_value=0.0, value=total_energy, step=0.1)
-        
-        if st.button("➕ Add Entry"):
-            entry = {
-                'date': today,
-                'estimated': total_energy,
-                'actual': actual_consumption,
-                'difference': actual_consumption - total_energy
-            }
-            st.session_state.daily_consumption.append(entry)
-            st.success("✅ Entry added successfully!")
+        log_entry_fragment(total_energy)
     
     with col1:
-        if st.session_state.daily_consumption:
-            df = pd.DataFrame(st.session_state.daily_consumption)
+        if st.session_state.history_len:
+            df, avg_consumption, max_consumption, min_consumption = get_history_view()
             
             # Create consumption chart
-            fig = px.line(df, x='date', y=['estimated', 'actual'], 
-                         title='Daily Energy Consumption Trend',
-                         labels={'value': 'Energy (kWh)', 'date': 'Date'})
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(st.session_state.fig, use_container_width=True)
             
             # Show recent entries
             st.subheader("📋 Recent Entries")
-            recent_df = df.tail(10).sort_values('date', ascending=False)
-            st.dataframe(recent_df, use_container_width=True)
+            recent_df = df.iloc[-10:]
+            # Entries normally arrive in date order, so reversing the tail is enough
+            if recent_df['date'].is_monotonic_increasing:
+                recent_df = recent_df.iloc[::-1]
+            else:
+                recent_df = recent_df.sort_values('date', ascending=False)
+            st.dataframe(
+                recent_df,
+                use_container_width=True,
+                column_config={'date': st.column_config.DateColumn('date')}
+            )
             
             # Statistics
             if len(df) > 1:
-                avg_consumption = df['actual'].mean()
-                max_consumption = df['actual'].max()
-                min_consumption = df['actual'].min()
-                
                 st.subheader("📈 Statistics")
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -212,18 +342,16 @@ if st.session_state.user_profile:
     # Appliance breakdown
     if profile['appliances']:
         st.subheader("🔌 Appliance Energy Breakdown")
-        appliance_data = []
-        for appliance in profile['appliances']:
-            consumption = {
-                "AC": 3.0, "Refrigerator": 1.5, "Washing Machine": 2.0,
-                "Dishwasher": 1.8, "Water Heater": 2.5, "Microwave": 1.2,
-                "TV": 0.5, "Laptop": 0.3
-            }.get(appliance, 0)
-            appliance_data.append({"Appliance": appliance, "Consumption": consumption})
+        import pandas as pd
+        import plotly.express as px
         
-        appliance_df = pd.DataFrame(appliance_data)
-        fig_pie = px.pie(appliance_df, values='Consumption', names='Appliance',
-                        title='Energy Consumption by Appliance')
+        names = profile['appliances']
+        appliance_df = pd.DataFrame({
+            "Appliance": pd.Categorical(names),
+            "Consumption": APPLIANCE_COST[[APPLIANCE_IDX[a] for a in names]]
+        })
+        fig_pie = px.pie(appliance_df, values='Consumption', names='Appliance')
+        fig_pie.update_layout(_pie_layout().to_plotly_json())
         st.plotly_chart(fig_pie, use_container_width=True)
 
 else: